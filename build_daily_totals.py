@@ -19,9 +19,26 @@ JSON output (what your iOS app reads):
   { "weekOf": "...", "parks": { "<Park>": { "days": [ {dow,hours,cost,revenue,pct}, ... ] } } }
 """
 
-import argparse, csv, json, os, sys
-from collections import defaultdict, OrderedDict
-from typing import Optional, List, Dict, Any
+import argparse, csv, json, logging, os, re, sys
+from collections import Counter, defaultdict
+from functools import lru_cache
+from operator import itemgetter
+from typing import Optional, List, Dict, Any, Tuple, Callable
+
+log = logging.getLogger(__name__)
+
+# Optional faster JSON backends. orjson only reads rates.json: its output
+# differs from json's (raw UTF-8, exponent and NaN spelling), and
+# daily_totals.json is committed, so it is written with ujson (byte-identical
+# to json) or stdlib json to keep local and CI builds the same.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
 
 DOW_ORDER = ["Mon","Tue","Wed","Thu","Fri","Sat","Sun"]
 DOW_ALIASES = {
@@ -33,20 +50,42 @@ DOW_ALIASES = {
     "saturday":"Sat","sat":"Sat","6":"Sat",
     "sunday":"Sun","sun":"Sun","7":"Sun",
 }
+_DOW3 = {d.lower(): d for d in DOW_ORDER}  # "mon" -> "Mon", ...
+# Alternate header names -> the column they stand for (headers are lowercased first)
+COLUMN_ALIASES = {"week_of":"weekof", "location":"park", "day":"dow", "sales":"revenue"}
+MISSING_COL = ""  # key in read_csv's column map for the empty pad cell
+_NUM_CLEAN = re.compile(r"[\$,%\s]")  # currency, thousands, percent and any whitespace
 
+@lru_cache(maxsize=4096)
 def norm_dow(s: str) -> str:
     if not s: return ""
+    # Fast path: almost every input starts with the 3-letter day name
+    dow = _DOW3.get(s[:3].lower())
+    if dow: return dow
     key = s.strip().lower()
     return DOW_ALIASES.get(key, s.strip()[:3].title())
 
+# Cell values repeat heavily ("0", "", "12.5%"), so the string parsers are
+# memoized; the public wrappers keep non-str inputs out of the cache.
+@lru_cache(maxsize=4096)
+def _parse_float_str(s: str) -> float:
+    s = _NUM_CLEAN.sub("", s)
+    if not s: return 0.0
+    try: return float(s)
+    except ValueError: return 0.0
+
 def parse_float(v):
     if v is None: return 0.0
     if isinstance(v,(int,float)): return float(v)
-    s = str(v).strip()
+    return _parse_float_str(str(v))
+
+@lru_cache(maxsize=4096)
+def _parse_pct_str(s: str) -> float:
+    s = s.strip()
     if not s: return 0.0
-    s = s.replace("$","").replace(",","").replace("%","")
-    try: return float(s)
-    except ValueError: return 0.0
+    if s.endswith("%"): return _parse_float_str(s)  # "12.72%" -> 12.72
+    val = _parse_float_str(s)
+    return val*100.0 if 0 < val <= 1 else val
 
 def parse_pct(v):
     # 12.72, "12.72%", or 0.1272 (Excel percent)
@@ -54,20 +93,50 @@ def parse_pct(v):
     if isinstance(v,(int,float)):
         val = float(v)
         return val*100.0 if 0 < val <= 1 else val
-    s = str(v).strip()
-    if not s: return 0.0
-    if s.endswith("%"): return parse_float(s)  # "12.72%" -> 12.72
-    val = parse_float(s)
-    return val*100.0 if 0 < val <= 1 else val
+    return _parse_pct_str(str(v))
+
+def new_park() -> Dict[str, Dict[str, Any]]:
+    return {d: {"dow": d, "hours": 0.0, "cost": 0.0, "revenue": 0.0, "pct": 0.0} for d in DOW_ORDER}
 
-def read_csv(path: str) -> List[Dict[str, Any]]:
-    with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows: List[Dict[str, Any]] = []
-        for r in reader:
-            row = { (k.strip() if isinstance(k,str) else k): (v.strip() if isinstance(v,str) else v) for k,v in r.items() }
-            rows.append(row)
-        return rows
+def read_csv(path: str) -> Tuple[Dict[str, List[int]], List[List[str]]]:
+    """
+    Returns (columns, rows): columns maps each field to the indices of every
+    header that holds it, in priority order (exact lowercased names first,
+    then COLUMN_ALIASES entries); rows are lists of stripped cells.
+    columns[MISSING_COL] is the index of a pad cell that is always empty and
+    stands in for columns the CSV doesn't have.
+    """
+    with open(path, newline="", encoding="utf-8", buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader, [])]
+        columns: Dict[str, List[int]] = {}
+        for i, h in enumerate(header):
+            if h not in COLUMN_ALIASES:
+                columns.setdefault(h, []).append(i)
+        for i, h in enumerate(header):
+            if h in COLUMN_ALIASES:
+                columns.setdefault(COLUMN_ALIASES[h], []).append(i)
+        columns[MISSING_COL] = [len(header)]
+        width = len(header)
+        rows: List[List[str]] = []
+        for row in reader:
+            if not row: continue
+            # Drop cells past the header, pad short rows, then add the pad cell
+            cells = [v.strip() for v in row[:width]]
+            cells += [""] * (width + 1 - len(cells))
+            rows.append(cells)
+        return columns, rows
+
+def field(columns: Dict[str, List[int]], name: str) -> Callable[[List[str]], str]:
+    """
+    Getter for a field's cell in a row. With one source column it is a plain
+    index; when several headers hold the field (e.g. weekOf and WeekOf, or
+    revenue and sales) it returns the first non-blank of them, per row.
+    """
+    idx = columns.get(name) or columns[MISSING_COL]
+    if len(idx) == 1:
+        return itemgetter(idx[0])
+    return lambda row: next((row[i] for i in idx if row[i]), "")
 
 def read_rates_json(path: str) -> Dict[str, float]:
     """
@@ -81,7 +150,12 @@ def read_rates_json(path: str) -> Dict[str, float]:
         return {}
     try:
         with open(path, encoding="utf-8") as f:
-            data = json.load(f)
+            if orjson is not None:
+                data = orjson.loads(f.read())
+            elif ujson is not None:
+                data = ujson.load(f)
+            else:
+                data = json.load(f)
     except Exception as e:
         print(f"WARNING: could not parse {path}: {e}")
         return {}
@@ -104,14 +178,21 @@ def read_rates_json(path: str) -> Dict[str, float]:
         print("WARNING: Unexpected rates.json shape; skipping rates.")
     return rates
 
-def pick_week_of(rows: List[Dict[str, Any]], cli_week_of: Optional[str]) -> str:
+def pick_week_of(rows: List[List[str]], week_cell: Callable[[List[str]], str], cli_week_of: Optional[str]) -> str:
     if cli_week_of: return cli_week_of
-    candidates = [r.get("weekOf") or r.get("WeekOf") or r.get("week_of") for r in rows]
-    candidates = [c for c in candidates if c]
+    candidates = [c for c in map(week_cell, rows) if c]
     if not candidates:
         sys.exit("ERROR: No weekOf provided. Add a weekOf column in CSV or use --week-of YYYY-MM-DD.")
     # take the most common
-    return sorted(candidates, key=lambda x: candidates.count(x), reverse=True)[0]
+    return Counter(candidates).most_common(1)[0][0]
+
+def write_json(path: str, obj: Any) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        if ujson is not None:
+            ujson.dump(obj, f, indent=2, escape_forward_slashes=False)
+        else:
+            json.dump(obj, f, indent=2)
+        f.write("\n")
 
 def main():
     ap = argparse.ArgumentParser(description="Build daily_totals.json from CSV")
@@ -119,47 +200,66 @@ def main():
     ap.add_argument("--output", "-o", default="daily_totals.json", help="Output JSON path")
     ap.add_argument("--week-of", help='Override weekOf (e.g., "2025-09-01" or "09-01-2025")')
     ap.add_argument("--rates", default="rates.json", help="Path to rates.json for hourly rates (default: rates.json)")
+    ap.add_argument("--verbose", "-v", action="store_true", help="Log each skipped row")
     args = ap.parse_args()
+    if args.verbose:
+        logging.basicConfig(level=logging.DEBUG, format="%(message)s")
 
     if not os.path.exists(args.input):
         sys.exit(f"CSV not found: {args.input}")
-    rows = read_csv(args.input)
+    columns, rows = read_csv(args.input)
     if not rows:
         sys.exit("CSV is empty.")
 
-    week_of = pick_week_of(rows, args.week_of)
+    # Resolve column positions once from the header
+    week_cell    = field(columns, "weekof")
+    park_cell    = field(columns, "park")
+    dow_cell     = field(columns, "dow")
+    hours_cell   = field(columns, "hours")
+    cost_cell    = field(columns, "cost")
+    revenue_cell = field(columns, "revenue")
+    pct_cell     = field(columns, "pct")
+
+    week_of = pick_week_of(rows, week_cell, args.week_of)
     rates = read_rates_json(args.rates)
+    rates_lc = {k.lower(): v for k, v in rates.items()}  # match park names case-insensitively
 
     # parks -> dow -> record
-    parks: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+    # Each park starts with all seven days zeroed (Mon..Sun); CSV rows overwrite them.
+    parks: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(new_park)
+    rate_cache: Dict[str, float] = {}
+    bad_park = bad_dow = 0
 
     for r in rows:
         # Filter: only process rows matching the target weekOf
-        row_week_of = (r.get("weekOf") or r.get("WeekOf") or r.get("week_of") or "").strip()
-        if row_week_of != week_of:
+        if week_cell(r) != week_of:
             continue  # Skip rows from other weeks
-        
-        park = (r.get("park") or r.get("Park") or r.get("location") or "").strip()
+
+        park = park_cell(r)
         if not park:
-            print("Skipping row with empty park:", r); continue
+            bad_park += 1; log.debug("skip empty park: %r", r[:-1]); continue
 
-        dow = norm_dow(r.get("dow") or r.get("DOW") or r.get("day") or "")
+        dow = norm_dow(dow_cell(r))
         if dow not in DOW_ORDER:
-            print(f"Skipping row with bad dow ({dow}):", r); continue
+            bad_dow += 1; log.debug("skip bad dow (%s): %r", dow, r[:-1]); continue
 
-        hours   = round(parse_float(r.get("hours")), 2)
-        revenue = round(parse_float(r.get("revenue") or r.get("sales")), 2)
-        cost    = round(parse_float(r.get("cost")), 2)
-        pct     = round(parse_pct(r.get("pct")), 2)
+        cost_raw = cost_cell(r)
+        pct_raw  = pct_cell(r)
+        hours   = round(parse_float(hours_cell(r)), 2)
+        revenue = round(parse_float(revenue_cell(r)), 2)
+        cost    = round(parse_float(cost_raw), 2)
+        pct     = round(parse_pct(pct_raw), 2)
 
         # Auto-compute cost from hours * rate if cost missing/zero
-        if (cost == 0.0 or not r.get("cost")) and hours > 0:
-            rate = rates.get(park, 0.0)
+        if (cost == 0.0 or not cost_raw) and hours > 0:
+            rate = rate_cache.get(park)
+            if rate is None:
+                rate = rate_cache[park] = rates_lc.get(park.lower(), 0.0)
             if rate > 0:
                 cost = round(hours * rate, 2)
 
         # Auto-compute pct from cost and revenue if missing/zero
-        if (pct == 0.0 or not r.get("pct")) and cost > 0 and revenue > 0:
+        if (pct == 0.0 or not pct_raw) and cost > 0 and revenue > 0:
             pct = round((cost / revenue) * 100.0, 2)
 
         parks[park][dow] = {
@@ -170,23 +270,15 @@ def main():
             "pct": pct
         }
 
-    # Fill missing days with zeros; sort parks alphabetically
-    out_parks = OrderedDict()
-    for park_name in sorted(parks.keys()):
-        by_dow = parks[park_name]
-        day_list = []
-        for d in DOW_ORDER:
-            if d in by_dow:
-                day_list.append(by_dow[d])
-            else:
-                day_list.append({"dow": d, "hours": 0.0, "cost": 0.0, "revenue": 0.0, "pct": 0.0})
-        out_parks[park_name] = {"days": day_list}
+    if bad_park or bad_dow:
+        print(f"Skipped {bad_park} empty-park, {bad_dow} bad-dow rows" + ("" if args.verbose else " (use -v to list them)"))
+
+    # Sort parks alphabetically; days are already in DOW_ORDER
+    out_parks = {name: {"days": list(parks[name].values())} for name in sorted(parks)}
 
     result = {"weekOf": week_of, "parks": out_parks}
 
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2)
-        f.write("\n")
+    write_json(args.output, result)
 
     print(f"Wrote {args.output} (weekOf={week_of}, parks={len(out_parks)})")
 